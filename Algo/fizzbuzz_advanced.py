@@ -14,20 +14,28 @@ JSON file to create the fizzbuzz_map dict.
 """
 
 # Imports --------------------------------------------------------------------
-import argparse
+# argparse (~10ms) is imported only when needed, see main()
+import sys
 
 
 # Functions ------------------------------------------------------------------
-def parse_arguments():
+def parse_arguments(argv=None):
     """
     Parse command-line arguments : upper bound 'n' of the FizzBuzz program
     and optional custom rules.
 
+    Parameters
+    ----------
+    argv : list, optional
+        Arguments to parse (default: sys.argv[1:])
+
     Returns
     -------
     Namespace
         Parsed arguments : upper bound n (+ ruleset)
     """
+    import argparse
+
     parser = argparse.ArgumentParser(
         formatter_class=argparse.ArgumentDefaultsHelpFormatter,
         description="Custom FizzBuzz program"
@@ -40,10 +48,10 @@ def parse_arguments():
                         help="FizzBuzz custom rules as 'divisor:word' \
                              (e.g., 3:Fizz 5:Buzz).")
 
-    return parser.parse_args()
+    return parser.parse_args(argv)
 
 
-def format_rules(rules_string):
+def parse_rules(rules_string):
     """
     Convert the custom rules string to a dictionary.
 
@@ -55,10 +63,33 @@ def format_rules(rules_string):
     Returns
     -------
     rules_dict : dict
+
+    Raises
+    ------
+    ValueError
+        If a rule is not formatted as 'divisor:word'
+    """
+    return {int(divisor): word for divisor, word
+            in (rule.split(':') for rule in rules_string)}
+
+
+def format_rules(rules_string):
+    """
+    Convert the custom rules string to a dictionary,
+    printing an error message if invalid.
+
+    Parameters
+    ----------
+    rules_string : str
+        Rule(s) passed as 'divisor:word'
+
+    Returns
+    -------
+    rules_dict : dict
+        Or False if invalid
     """
     try:
-        return {int(divisor): word for divisor, word
-                in (rule.split(':') for rule in rules_string)}
+        return parse_rules(rules_string)
     except ValueError:
         print("Invalid custom rules format. Please enter a valid ruleset:\n \
             > 'divisor:word' (e.g., --rules 3:Fizz 5:Buzz)")
@@ -90,15 +121,21 @@ def fizzbuzz_generator(n, fizzbuzz_map):
 
 # main -----------------------------------------------------------------------
 def main():
-    args = parse_arguments()
-    if args.rules:
-        fizzbuzz_map = format_rules(args.rules)
+    # Fast path: a bare upper bound does not need argparse
+    if len(sys.argv) == 2 and sys.argv[1].isdecimal():
+        n, rules = int(sys.argv[1]), None
+    else:
+        args = parse_arguments()
+        n, rules = args.n, args.rules
+
+    if rules:
+        fizzbuzz_map = format_rules(rules)
         if not fizzbuzz_map:
             return  # Exit if error (custom rules format)
     else:
         fizzbuzz_map = {3: 'Fizz', 5: 'Buzz'}
 
-    for sequence in fizzbuzz_generator(args.n, fizzbuzz_map):
+    for sequence in fizzbuzz_generator(n, fizzbuzz_map):
         print(sequence)
 
 
@@ -0,0 +1,98 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+"""
+#==============================#
+| FizzBuzz - Fulll hiring test |
+#==============================#
+> Thomas Rigole
+---------------
+> Warm runner :
+Persistent process answering FizzBuzz requests over a Unix socket,
+so that frequent tiny requests do not pay the interpreter start-up.
+
+Start:  python fizzbuzz_runner.py /tmp/fizzbuzz.sock &
+Query:  echo "15 3:Fizz 5:Buzz" | nc -U -N /tmp/fizzbuzz.sock
+        (one request per connection: "n [divisor:word ...]")
+"""
+
+# Imports --------------------------------------------------------------------
+import os
+import socketserver
+import sys
+
+from fizzbuzz_advanced import fizzbuzz_generator, parse_rules
+
+# Largest upper bound answered, the server is shared by all clients
+MAX_N = 100_000
+
+
+# Functions ------------------------------------------------------------------
+def answer(request):
+    """
+    Answer one request line, with the same rules as fizzbuzz_advanced.
+
+    Parameters
+    ----------
+    request : str
+        Upper bound n, then optional rules as 'divisor:word'
+
+    Yields
+    ------
+    str
+        Output lines, or an error message
+    """
+    tokens = request.split()
+    # Same upper bound parsing as the CLI (argparse type=int)
+    try:
+        n = int(tokens[0])
+    except (IndexError, ValueError):
+        yield "Invalid request, expected: n [divisor:word ...]\n"
+        return
+    if n > MAX_N:
+        yield f"Upper bound too large, the maximum is {MAX_N}\n"
+        return
+    try:
+        fizzbuzz_map = parse_rules(tokens[1:]) if len(tokens) > 1 else {3: 'Fizz', 5: 'Buzz'}
+    except ValueError:
+        fizzbuzz_map = {}
+    if not fizzbuzz_map or 0 in fizzbuzz_map:
+        yield "Invalid custom rules format, expected: 'divisor:word'\n"
+        return
+    for sequence in fizzbuzz_generator(n, fizzbuzz_map):
+        yield f"{sequence}\n"
+
+
+class _Handler(socketserver.StreamRequestHandler):
+    def handle(self):
+        request = self.rfile.readline().decode()
+        self.wfile.writelines(line.encode() for line in answer(request))
+
+
+class FizzBuzzRunner(socketserver.ThreadingUnixStreamServer):
+    """Unix socket server answering FizzBuzz requests."""
+
+    daemon_threads = True
+
+    def __init__(self, socket_path):
+        if os.path.exists(socket_path):
+            os.remove(socket_path)
+        super().__init__(socket_path, _Handler)
+
+    def server_close(self):
+        super().server_close()
+        os.remove(self.server_address)
+
+
+# main -----------------------------------------------------------------------
+def main():
+    if len(sys.argv) != 2:
+        print("Usage: fizzbuzz_runner.py SOCKET_PATH")
+        return
+
+    with FizzBuzzRunner(sys.argv[1]) as runner:
+        runner.serve_forever()
+
+
+if __name__ == "__main__":
+    main()
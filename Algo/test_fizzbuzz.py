@@ -0,0 +1,63 @@
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import unittest
+from fizzbuzz_runner import FizzBuzzRunner
+
+FIZZBUZZ_15 = "1\n2\nFizz\n4\nBuzz\nFizz\n7\n8\nFizz\nBuzz\n11\nFizz\n13\n14\nFizzBuzz\n"
+
+
+class TestFizzBuzzStartup(unittest.TestCase):
+
+    def test_startup_budget(self):
+        cwd = os.path.dirname(os.path.abspath(__file__))
+        result = subprocess.run([sys.executable, '-X', 'importtime', 'fizzbuzz_advanced.py', '15'],
+                                capture_output=True, text=True, check=True, cwd=cwd)
+        self.assertEqual(result.stdout, FIZZBUZZ_15)
+        self.assertNotIn('argparse', result.stderr)
+
+        # Cumulative import time (us) of the module itself, interpreter start-up excluded
+        budget_us = 10_000
+        result = subprocess.run([sys.executable, '-X', 'importtime', '-c', 'import fizzbuzz_advanced'],
+                                capture_output=True, text=True, check=True, cwd=cwd)
+        # "import time: self [us] | cumulative | imported package" lines, header skipped
+        rows = [line.split('|') for line in result.stderr.splitlines()[1:]]
+        imports = {name.strip(): int(cumulative) for _, cumulative, name in rows}
+        self.assertLess(imports['fizzbuzz_advanced'], budget_us)
+
+
+class TestFizzBuzzRunner(unittest.TestCase):
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.runner = FizzBuzzRunner(os.path.join(self.tmpdir.name, 'fizzbuzz.sock'))
+        threading.Thread(target=self.runner.serve_forever, daemon=True).start()
+
+    def tearDown(self):
+        self.runner.shutdown()
+        self.runner.server_close()
+        self.tmpdir.cleanup()
+
+    def _query(self, request):
+        with socket.socket(socket.AF_UNIX) as client:
+            client.connect(self.runner.server_address)
+            client.sendall(f"{request}\n".encode())
+            return b''.join(iter(lambda: client.recv(4096), b'')).decode()
+
+    def test_runner_answers(self):
+        self.assertEqual(self._query('15'), FIZZBUZZ_15)
+        self.assertEqual(self._query('4 2:Foo'), "1\nFoo\n3\nFoo\n")
+        # Same upper bounds as the CLI
+        self.assertEqual(self._query('0'), "")
+        self.assertEqual(self._query('-3'), "")
+        self.assertIn("Invalid request", self._query('²'))
+        self.assertIn("too large", self._query('100000000'))
+        self.assertIn("Invalid custom rules", self._query('3 Fizz'))
+        self.assertIn("Invalid custom rules", self._query('3 0:Zero'))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,170 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+"""
+#==========================================#
+| Retail ETL benchmark - Fulll hiring test |
+#==========================================#
+> Thomas Rigole
+---------------
+Times the CSV ingestion, the dedup on reload and each stakeholder
+SQL query on generated data (see retail_generator.py), and writes
+rows/s, DB size and peak memory per size as JSON.
+Each size runs in its own process so that peak memory is not shared.
+"""
+
+import argparse
+import csv
+import datetime
+import json
+import os
+import resource
+import sqlite3
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+
+from retail_generator import CHUNK_SIZE, write_csv, write_sqlite
+
+DEFAULT_SIZES = [10**4, 10**6, 10**8]
+
+# Stakeholder questions
+QUERIES = {
+    "transactions_on_14_01_2022": """
+        SELECT COUNT(*) FROM transactions
+        WHERE transaction_date = '2022-01-14'
+    """,
+    "total_sell_inc_tax": """
+        SELECT SUM(amount_inc_tax) FROM transactions
+        WHERE category = 'SELL'
+    """,
+    "echo_dot_balance_by_date": """
+        SELECT transaction_date,
+               SUM(CASE category WHEN 'SELL' THEN amount_inc_tax ELSE -amount_inc_tax END) AS balance
+        FROM transactions
+        WHERE name = 'Amazon Echo Dot'
+        GROUP BY transaction_date
+        ORDER BY transaction_date
+    """,
+    "echo_dot_cumulated_balance_by_date": """
+        SELECT transaction_date,
+               SUM(SUM(CASE category WHEN 'SELL' THEN amount_inc_tax ELSE -amount_inc_tax END))
+                   OVER (ORDER BY transaction_date) AS cumulated_balance
+        FROM transactions
+        WHERE name = 'Amazon Echo Dot'
+        GROUP BY transaction_date
+        ORDER BY transaction_date
+    """,
+}
+
+
+def create_id_index(con):
+    """Creates the unique index on id the dedup relies on (the provided table has none)."""
+    con.execute("CREATE UNIQUE INDEX IF NOT EXISTS transactions_id ON transactions (id)")
+
+
+def ingest_csv(con, path):
+    """
+    Loads a daily CSV file into the transactions table, skipping known ids.
+
+    Args:
+        (Connection) con - SQLite connection
+        (str) path - CSV path, named retail_DD_MM_YYYY.csv
+    Returns:
+        (int) number of rows inserted
+    """
+    transaction_date = datetime.datetime.strptime(
+        os.path.basename(path), "retail_%d_%m_%Y.csv").date().isoformat()
+    create_id_index(con)
+    before = con.total_changes
+    with open(path, newline="") as f:
+        rows = (
+            (row["id"], transaction_date, row["category"], row["description"],
+             int(row["quantity"]), float(row["amount_excl_tax"]), float(row["amount_inc_tax"]))
+            for row in csv.DictReader(f)
+        )
+        while chunk := list(islice(rows, CHUNK_SIZE)):
+            con.executemany("INSERT OR IGNORE INTO transactions VALUES (?, ?, ?, ?, ?, ?, ?)", chunk)
+    con.commit()
+    return con.total_changes - before
+
+
+def _timed(func, *args):
+    start_time = time.perf_counter()
+    result = func(*args)
+    return result, time.perf_counter() - start_time
+
+
+def run_size(n_rows, workdir, seed=0):
+    """
+    Runs the benchmark for one size: n_rows of history + a CSV of n_rows.
+
+    Args:
+        (int) n_rows - number of rows of the history and of the CSV
+        (str) workdir - directory for the generated files
+        (int) seed - random seed
+    Returns:
+        (dict) timings, rows/s, DB size and peak memory
+    """
+    db_path = os.path.join(workdir, f"retail_{n_rows}.db")
+    csv_path = os.path.join(workdir, "retail_15_01_2022.csv")
+    # Distinct seeds: the CSV must not share ids with the history
+    write_sqlite(db_path, n_rows, seed)
+    write_csv(csv_path, n_rows, seed + 1)
+
+    con = sqlite3.connect(db_path)
+    try:
+        # Indexing the history is a one-off setup cost, reported apart from the ingestion
+        _, index_s = _timed(create_id_index, con)
+        inserted, ingest_s = _timed(ingest_csv, con, csv_path)
+        reinserted, reload_s = _timed(ingest_csv, con, csv_path)
+        db_rows = n_rows + inserted
+        queries = {}
+        for name, query in QUERIES.items():
+            _, query_s = _timed(lambda q: con.execute(q).fetchall(), query)
+            queries[name] = {"seconds": query_s, "rows_per_s": db_rows / query_s}
+    finally:
+        con.close()
+
+    result = {
+        "rows": n_rows,
+        "index": {"rows": n_rows, "seconds": index_s},
+        "ingest": {"rows": inserted, "seconds": ingest_s, "rows_per_s": n_rows / ingest_s},
+        "reload": {"rows": reinserted, "seconds": reload_s, "rows_per_s": n_rows / reload_s},
+        "queries": queries,
+        "db_size_bytes": os.path.getsize(db_path),
+        # ru_maxrss is in KB on Linux
+        "peak_memory_kb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+    }
+    os.remove(db_path)
+    os.remove(csv_path)
+    return result
+
+
+def run_benchmark(sizes, workdir, seed=0):
+    """Runs each size in a fresh process and returns the list of results."""
+    results = []
+    for n_rows in sizes:
+        with ProcessPoolExecutor(max_workers=1) as pool:
+            results.append(pool.submit(run_size, n_rows, workdir, seed).result())
+        print(f"{n_rows} rows: ingest {results[-1]['ingest']['rows_per_s']:,.0f} rows/s")
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Retail ETL and SQL benchmark")
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES, help="Numbers of rows")
+    parser.add_argument("--output", default="retail_benchmark.json", help="JSON results path")
+    parser.add_argument("--workdir", help="Directory for generated files (default: temporary)")
+    parser.add_argument("--seed", type=int, default=0, help="Random seed")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory(dir=args.workdir) as workdir:
+        results = run_benchmark(args.sizes, workdir, args.seed)
+    with open(args.output, "w") as f:
+        json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
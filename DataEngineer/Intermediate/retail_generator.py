@@ -0,0 +1,142 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+"""
+#===========================================#
+| Retail data generator - Fulll hiring test |
+#===========================================#
+> Thomas Rigole
+---------------
+Deterministic generator of retail transactions, shaped like the provided
+`retail.db` history and `retail_DD_MM_YYYY.csv` daily files
+(same products, unit prices, BUY/SELL categories and 20% tax).
+"""
+
+import argparse
+import csv
+import datetime
+import random
+import sqlite3
+import uuid
+from itertools import islice
+
+# Unit prices (excl. tax) observed in the provided history
+PRODUCTS = {
+    "Amazon Echo Dot": 24.99,
+    "Apple iPhone 14": 799.99,
+    "Dell XPS 13": 1099.99,
+    "Fitbit Charge 5": 89.99,
+    "Levis Jeans": 39.99,
+    "Nike Running Shoes": 79.99,
+    "Patagonia Jacket": 159.99,
+    "Ray-Ban Sunglasses": 109.99,
+}
+CATEGORIES = ("BUY", "SELL")
+TAX_RATE = 0.20
+MAX_QUANTITY = 5
+# ~50 transactions per day in the provided history
+ROWS_PER_DAY = 50
+START_DATE = datetime.date(2022, 1, 1)
+
+CSV_HEADER = ["id", "category", "description", "quantity", "amount_excl_tax", "amount_inc_tax"]
+TRANSACTIONS_SCHEMA = """
+CREATE TABLE IF NOT EXISTS transactions (
+    id TEXT,
+    transaction_date TEXT,
+    category TEXT,
+    name TEXT,
+    quantity BIGINT,
+    amount_excl_tax FLOAT,
+    amount_inc_tax FLOAT
+)
+"""
+# Rows buffered per executemany() call
+CHUNK_SIZE = 100_000
+
+
+def generate_transactions(n_rows, seed=0, start_date=START_DATE, rows_per_day=ROWS_PER_DAY):
+    """
+    Generates n_rows transactions, the same sequence for a given seed.
+
+    Args:
+        (int) n_rows - number of transactions to generate
+        (int) seed - random seed
+        (date) start_date - date of the first transaction
+        (int) rows_per_day - number of transactions per date
+    Yields:
+        (tuple) id, transaction_date, category, name, quantity, amount_excl_tax, amount_inc_tax
+    """
+    rng = random.Random(seed)
+    names = list(PRODUCTS)
+    for i in range(n_rows):
+        transaction_date = (start_date + datetime.timedelta(days=i // rows_per_day)).isoformat()
+        name = rng.choice(names)
+        quantity = rng.randint(1, MAX_QUANTITY)
+        amount_excl_tax = round(PRODUCTS[name] * quantity, 2)
+        amount_inc_tax = round(amount_excl_tax * (1 + TAX_RATE), 2)
+        yield (
+            str(uuid.UUID(int=rng.getrandbits(128), version=4)),
+            transaction_date,
+            rng.choice(CATEGORIES),
+            name,
+            quantity,
+            amount_excl_tax,
+            amount_inc_tax,
+        )
+
+
+def write_csv(path, n_rows, seed=0):
+    """
+    Writes a daily CSV file (no date column, the date is in the file name).
+
+    Args:
+        (str) path - output CSV path, e.g. retail_15_01_2022.csv
+        (int) n_rows - number of transactions
+        (int) seed - random seed
+    """
+    with open(path, "w", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(CSV_HEADER)
+        writer.writerows(
+            (id_, category, name, quantity, excl, inc)
+            for id_, _, category, name, quantity, excl, inc in generate_transactions(
+                n_rows, seed, rows_per_day=max(n_rows, 1))
+        )
+
+
+def write_sqlite(path, n_rows, seed=0):
+    """
+    Writes a SQLite history with the `transactions` table of retail.db.
+
+    Args:
+        (str) path - output database path
+        (int) n_rows - number of transactions
+        (int) seed - random seed
+    """
+    con = sqlite3.connect(path)
+    try:
+        con.execute(TRANSACTIONS_SCHEMA)
+        rows = generate_transactions(n_rows, seed)
+        while chunk := list(islice(rows, CHUNK_SIZE)):
+            con.executemany("INSERT INTO transactions VALUES (?, ?, ?, ?, ?, ?, ?)", chunk)
+        con.commit()
+    finally:
+        con.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Deterministic retail data generator")
+    parser.add_argument("n_rows", type=int, help="Number of transactions")
+    parser.add_argument("--csv", help="Output daily CSV path")
+    parser.add_argument("--db", help="Output SQLite history path")
+    parser.add_argument("--seed", type=int, default=0, help="Random seed")
+    args = parser.parse_args()
+
+    if args.csv:
+        write_csv(args.csv, args.n_rows, args.seed)
+    if args.db:
+        write_sqlite(args.db, args.n_rows, args.seed)
+
+
+if __name__ == "__main__":
+    main()
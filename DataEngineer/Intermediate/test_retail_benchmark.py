@@ -0,0 +1,66 @@
+import os
+import sqlite3
+import tempfile
+import unittest
+
+from retail_benchmark import QUERIES, ingest_csv, run_size
+from retail_generator import PRODUCTS, TAX_RATE, generate_transactions, write_csv, write_sqlite
+
+
+class TestRetailGenerator(unittest.TestCase):
+
+    def test_generate_transactions_deterministic(self):
+        self.assertEqual(list(generate_transactions(100, seed=1)), list(generate_transactions(100, seed=1)))
+        self.assertNotEqual(list(generate_transactions(100, seed=1)), list(generate_transactions(100, seed=2)))
+
+    def test_generate_transactions_amounts(self):
+        for _, _, category, name, quantity, excl, inc in generate_transactions(1000):
+            self.assertIn(category, ('BUY', 'SELL'))
+            self.assertAlmostEqual(excl, PRODUCTS[name] * quantity, places=2)
+            self.assertAlmostEqual(inc, excl * (1 + TAX_RATE), places=2)
+
+    def test_generate_transactions_dates(self):
+        dates = [row[1] for row in generate_transactions(100, rows_per_day=50)]
+        self.assertEqual(sorted(set(dates)), ['2022-01-01', '2022-01-02'])
+
+
+class TestRetailBenchmark(unittest.TestCase):
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.db_path = os.path.join(self.tmpdir.name, 'retail.db')
+        self.csv_path = os.path.join(self.tmpdir.name, 'retail_15_01_2022.csv')
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def test_ingest_csv_dedup_on_reload(self):
+        write_sqlite(self.db_path, 200)
+        write_csv(self.csv_path, 54, seed=1)
+        con = sqlite3.connect(self.db_path)
+        self.assertEqual(ingest_csv(con, self.csv_path), 54)
+        # Reloading the same file inserts nothing
+        self.assertEqual(ingest_csv(con, self.csv_path), 0)
+        count = con.execute("SELECT COUNT(*) FROM transactions WHERE transaction_date = '2022-01-15'")
+        self.assertEqual(count.fetchone()[0], 54)
+        con.close()
+
+    def test_queries_on_provided_history(self):
+        db_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'retail.db')
+        con = sqlite3.connect(f'file:{db_path}?mode=ro', uri=True)
+        for query in QUERIES.values():
+            self.assertTrue(con.execute(query).fetchall())
+        con.close()
+
+    def test_run_size(self):
+        result = run_size(1000, self.tmpdir.name)
+        self.assertEqual(result['index']['rows'], 1000)
+        self.assertEqual(result['ingest']['rows'], 1000)
+        self.assertEqual(result['reload']['rows'], 0)
+        self.assertEqual(set(result['queries']), set(QUERIES))
+        self.assertGreater(result['db_size_bytes'], 0)
+        self.assertGreater(result['peak_memory_kb'], 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
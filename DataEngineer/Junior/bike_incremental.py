@@ -0,0 +1,267 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+"""
+#=======================================================#
+| Bike Sharing - Incremental append - Fulll hiring test |
+#=======================================================#
+> Thomas Rigole
+---------------
+Appends new trip files to a cleaned SQLite store without recomputing
+the whole history:
+- the Trip Duration mean/variance (3 std outlier bounds) are updated online
+- earlier rows are re-flagged only when the bounds move past a tolerance,
+  and only the rows between the old and new bounds are read
+- the aggregates used by the statistics are updated with the new rows only
+"""
+
+import argparse
+import math
+import sqlite3
+
+import pandas as pd
+
+from bike_investigation import (drop_inconsistent_durations, duration_bounds,
+                                fill_missing_values, read_trips)
+
+# Re-flag earlier rows when a bound moves by more than this fraction of the bounds width
+REFLAG_TOLERANCE = 0.01
+
+# Aggregate kind -> counted column ('trip' is Start Station --> End Station)
+AGGREGATES = {
+    'month': 'Month',
+    'weekday': 'Weekday',
+    'hour': 'Hour',
+    'start': 'Start Station',
+    'end': 'End Station',
+    'user_type': 'User Type',
+    'gender': 'Gender',
+}
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS state (
+    id INTEGER PRIMARY KEY CHECK (id = 0),
+    n INTEGER, mean REAL, m2 REAL, lower REAL, upper REAL
+);
+-- Every ingested Id, including rows dropped as inconsistent, so that reloads are skipped
+CREATE TABLE IF NOT EXISTS ids (
+    Id PRIMARY KEY
+);
+CREATE TABLE IF NOT EXISTS aggregates (
+    kind TEXT, key TEXT, value REAL,
+    PRIMARY KEY (kind, key)
+);
+INSERT OR IGNORE INTO state VALUES (0, 0, 0.0, 0.0, NULL, NULL);
+"""
+
+
+def welford_update(n, mean, m2, values):
+    """
+    Merges a batch into running count/mean/M2 (Welford, batch form by Chan et al.).
+
+    Args:
+        (int) n, (float) mean, (float) m2 - running statistics
+        values - Pandas Series of the new values
+    Returns:
+        (int) n, (float) mean, (float) m2 - updated statistics
+    """
+    n_batch = len(values)
+    if not n_batch:
+        return n, mean, m2
+    mean_batch = values.mean()
+    m2_batch = ((values - mean_batch) ** 2).sum()
+    total = n + n_batch
+    delta = mean_batch - mean
+    return (total,
+            mean + delta * n_batch / total,
+            m2 + m2_batch + delta ** 2 * n * n_batch / total)
+
+
+def _is_outlier(durations, bounds):
+    lower, upper = bounds
+    if lower is None:
+        return pd.Series(False, index=durations.index)
+    return (durations < lower) | (durations > upper)
+
+
+def _update_aggregates(con, df, sign=1):
+    records = [('rows', 'all', sign * len(df)),
+               ('duration', 'total', sign * float(df['Trip Duration'].sum()))]
+    for kind, column in AGGREGATES.items():
+        if column in df.columns:
+            records += [(kind, str(key), sign * int(count)) for key, count in df[column].value_counts().items()]
+    trips = (df['Start Station'] + " --> " + df['End Station']).value_counts()
+    records += [('trip', key, sign * int(count)) for key, count in trips.items()]
+    con.executemany("INSERT INTO aggregates VALUES (?, ?, ?) "
+                    "ON CONFLICT (kind, key) DO UPDATE SET value = value + excluded.value", records)
+
+
+def _has_trips(con):
+    return con.execute("SELECT 1 FROM sqlite_master WHERE name = 'trips'").fetchone() is not None
+
+
+def _drop_known_ids(con, df):
+    con.execute('CREATE TEMP TABLE IF NOT EXISTS new_ids (Id)')
+    con.execute('DELETE FROM new_ids')
+    con.executemany('INSERT INTO new_ids VALUES (?)', ((id_,) for id_ in df['Id'].tolist()))
+    known = pd.read_sql('SELECT Id FROM ids WHERE Id IN (SELECT Id FROM new_ids)', con)['Id']
+    df = df[~df['Id'].isin(known)]
+    con.executemany('INSERT OR IGNORE INTO ids VALUES (?)', ((id_,) for id_ in df['Id'].tolist()))
+    return df
+
+
+def _insert_trips(con, df):
+    # Plain executemany rather than to_sql, which commits on its own
+    con.execute(pd.io.sql.get_schema(df, 'trips').replace('CREATE TABLE', 'CREATE TABLE IF NOT EXISTS', 1))
+    df = df.assign(**{column: df[column].dt.strftime('%Y-%m-%d %H:%M:%S')
+                      for column in df.select_dtypes('datetime').columns})
+    rows = df.astype(object).where(df.notna(), None).itertuples(index=False, name=None)
+    columns = ', '.join(f'"{column}"' for column in df.columns)
+    con.executemany(f'INSERT INTO trips ({columns}) VALUES ({", ".join("?" * len(df.columns))})', rows)
+
+
+def _reflag(con, old_bounds, new_bounds):
+    """Re-flags the stored rows between the old and new bounds, returns their count."""
+    if old_bounds[0] is None:
+        rows = pd.read_sql('SELECT * FROM trips', con)
+    else:
+        (old_lower, old_upper), (new_lower, new_upper) = old_bounds, new_bounds
+        rows = pd.read_sql('SELECT * FROM trips WHERE "Trip Duration" BETWEEN ? AND ? '
+                           'OR "Trip Duration" BETWEEN ? AND ?', con,
+                           params=(min(old_lower, new_lower), max(old_lower, new_lower),
+                                   min(old_upper, new_upper), max(old_upper, new_upper)))
+    outliers = _is_outlier(rows['Trip Duration'], new_bounds)
+    changed = rows[outliers != rows['Outlier'].astype(bool)]
+    con.executemany('UPDATE trips SET Outlier = ? WHERE Id = ?',
+                    zip(outliers[changed.index].astype(int).tolist(), changed['Id'].tolist()))
+    _update_aggregates(con, changed[~outliers[changed.index]], sign=1)
+    _update_aggregates(con, changed[outliers[changed.index]], sign=-1)
+    return len(changed)
+
+
+def append_data(con, df, tolerance=REFLAG_TOLERANCE):
+    """
+    Appends new "uncleaned" trips (see read_trips) to the store.
+
+    Args:
+        (Connection) con - SQLite connection to the store
+        df - "Uncleaned" Pandas DataFrame of the new trips
+        (float) tolerance - bounds move (fraction of the bounds width) triggering a re-flag
+    Returns:
+        (dict) new rows, new outliers and re-flagged earlier rows counts
+    """
+    con.executescript(SCHEMA)
+
+    # One transaction: a failure leaves the store as before, and the file can be re-appended
+    con.execute('BEGIN')
+    try:
+        # Same steps as clean_data, on the new rows only
+        df = df.drop_duplicates()
+        df = _drop_known_ids(con, df)
+        df = df.dropna(subset=['Start Time', 'End Time', 'Trip Duration'])
+        df = fill_missing_values(df)
+
+        # Outlier bounds: statistics on all rows after NA, as in clean_data
+        n, mean, m2, lower, upper = con.execute('SELECT n, mean, m2, lower, upper FROM state').fetchone()
+        n, mean, m2 = welford_update(n, mean, m2, df['Trip Duration'])
+        old_bounds = (lower, upper)
+        if n > 1:
+            new_bounds = duration_bounds(mean, math.sqrt(m2 / (n - 1)))
+        else:
+            new_bounds = (None, None)
+
+        reflagged = 0
+        moved = new_bounds[0] is not None and (
+            old_bounds[0] is None or
+            max(abs(new_bounds[0] - old_bounds[0]), abs(new_bounds[1] - old_bounds[1]))
+            > tolerance * (new_bounds[1] - new_bounds[0]))
+        if moved:
+            if _has_trips(con):
+                reflagged = _reflag(con, old_bounds, new_bounds)
+            lower, upper = new_bounds
+
+        df = drop_inconsistent_durations(df)
+        df = df.assign(Outlier=_is_outlier(df['Trip Duration'], (lower, upper)).astype(int))
+        _insert_trips(con, df)
+        con.execute('CREATE UNIQUE INDEX IF NOT EXISTS trips_id ON trips (Id)')
+        con.execute('CREATE INDEX IF NOT EXISTS trips_duration ON trips ("Trip Duration")')
+        _update_aggregates(con, df[df['Outlier'] == 0])
+        con.execute('UPDATE state SET n = ?, mean = ?, m2 = ?, lower = ?, upper = ?',
+                    (n, float(mean), float(m2), lower, upper))
+        con.commit()
+    except BaseException:
+        con.rollback()
+        raise
+
+    summary = {'rows': len(df), 'outliers': int(df['Outlier'].sum()), 'reflagged': reflagged}
+    print(f"> {summary['rows']} new rows appended ({summary['outliers']} outliers), "
+          f"{summary['reflagged']} earlier rows re-flagged.")
+    return summary
+
+
+def append_trips(store_path, csv_path, tolerance=REFLAG_TOLERANCE):
+    """Appends a new trips csv to the store, see append_data."""
+    con = sqlite3.connect(store_path)
+    try:
+        return append_data(con, read_trips(csv_path), tolerance)
+    finally:
+        con.close()
+
+
+def load_store(store_path, month='all', day='all'):
+    """
+    Loads the cleaned trips of the store, filtered by month and day if applicable.
+
+    Args:
+        (str) store_path - SQLite store path
+        (str) month - name of the month to filter by, or "all" to apply no month filter
+        (str) day - name of the day of week to filter by, or "all" to apply no day filter
+    Returns:
+        df - Pandas DataFrame like load_data
+    """
+    query, params = 'SELECT * FROM trips WHERE Outlier = 0', []
+    if month != 'all':
+        query, params = query + ' AND Month = ?', params + [month]
+    if day != 'all':
+        query, params = query + ' AND Weekday = ?', params + [day]
+    con = sqlite3.connect(store_path)
+    try:
+        df = pd.read_sql(query, con, params=params, parse_dates=['Start Time', 'End Time'])
+    finally:
+        con.close()
+    return df.drop(columns='Outlier')
+
+
+def read_aggregates(store_path, kind):
+    """
+    Reads a stored aggregate of the cleaned trips.
+
+    Args:
+        (str) store_path - SQLite store path
+        (str) kind - 'rows', 'duration' or one of AGGREGATES / 'trip'
+    Returns:
+        Pandas Series key -> value, sorted by key
+    """
+    con = sqlite3.connect(store_path)
+    try:
+        df = pd.read_sql('SELECT key, value FROM aggregates WHERE kind = ? AND value != 0 ORDER BY key',
+                         con, params=(kind,))
+    finally:
+        con.close()
+    return df.set_index('key')['value']
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Append new bike trips files to a cleaned store")
+    parser.add_argument('store', help="SQLite store path (created if needed)")
+    parser.add_argument('csv', nargs='+', help="New trips csv file(s)")
+    parser.add_argument('--tolerance', type=float, default=REFLAG_TOLERANCE,
+                        help="Bounds move (fraction of the bounds width) triggering a re-flag")
+    args = parser.parse_args()
+
+    for csv_path in args.csv:
+        append_trips(args.store, csv_path, args.tolerance)
+
+
+if __name__ == "__main__":
+    main()
@@ -11,14 +11,16 @@
 
 import time
 
+# pandas (~300ms) and bike_sketches are imported where needed, to keep start-up fast
 # import numpy as np
-import pandas as pd
 
 CITY_DATA = {
     "chicago": "chicago.csv",
     "new york city": "new_york_city.csv",
     "washington": "washington.csv",
 }
+# Trip Duration outliers are further than OUTLIER_STD std from the mean
+OUTLIER_STD = 3
 
 
 def get_filters():
@@ -61,6 +63,71 @@ def get_filters():
     return city, month, day
 
 
+def fill_missing_values(df):
+    """
+    Replaces missing values of the non relevant columns.
+
+    Args:
+        df - Pandas DataFrame
+    Returns:
+        df - Pandas DataFrame without missing User Type/Gender
+    """
+    df['User Type'] = df['User Type'].fillna('Unknown')
+    if 'Gender' in df.columns:
+        df['Gender'] = df['Gender'].fillna('Unknown')
+    # Replace with the most common year if needed
+    # if 'Birth Year' in df.columns:
+    #     df['Birth Year'] = df['Birth Year'].fillna(df['Birth Year'].mode()[0])
+    return df
+
+
+def duration_bounds(mean, std):
+    """
+    Limits to detect Trip Duration outliers (3 std).
+
+    Args:
+        (float) mean - Trip Duration mean
+        (float) std - Trip Duration standard deviation
+    Returns:
+        (float) lower_bound, (float) upper_bound
+    """
+    return mean - std * OUTLIER_STD, mean + std * OUTLIER_STD
+
+
+def drop_inconsistent_durations(df):
+    """
+    Drops rows with negative or inconsistent (Start/End Time vs Trip Duration) durations.
+
+    Args:
+        df - Pandas DataFrame
+    Returns:
+        df - Pandas DataFrame with a Calculated Trip Duration column
+    """
+    # Check year (supposed 2017)
+    # print(df.groupby(df['Start Time'].dt.year).size())
+
+    # Drop negative duration rows
+    df = df[df['Trip Duration'] > 0]
+
+    # Check Start/End Time with Trip Duration
+    df['Calculated Trip Duration'] = (df['End Time'] - df['Start Time']).dt.total_seconds()
+    # Drop negative calculated duration rows
+    print(f"Negative Trip Duration rows removed : {len(df[df['Calculated Trip Duration'] < 0])}")
+    df = df[df['Calculated Trip Duration'] > 0]
+
+    # Identify inconsistent duration rows
+    inconsistent_duration = df[
+        (abs(df['Trip Duration'] - df['Calculated Trip Duration']) >
+         df[['Trip Duration', 'Calculated Trip Duration']].min(axis=1) * 0.01) &  # 1% tolerence
+        (abs(df['Trip Duration'] - df['Calculated Trip Duration']) > 300)  # 300 secs min threshold
+    ]
+    print(f"Anomalies/inconsistencies in trip durations removed : {len(inconsistent_duration)}")
+    # Drop rows with inconsistent duration
+    df = df.drop(inconsistent_duration.index)
+
+    return df
+
+
 def clean_data(df):
     """
     Cleans data of the current df by handling missing values, duplicates, and coherence issues.
@@ -85,19 +152,12 @@ def clean_data(df):
     # ======================
     # Replace missing values
     # ----------------------
-    df['User Type'] = df['User Type'].fillna('Unknown')
-    if 'Gender' in df.columns:
-        df['Gender'] = df['Gender'].fillna('Unknown')
-    # Replace with the most common year if needed
-    # if 'Birth Year' in df.columns:
-    #     df['Birth Year'] = df['Birth Year'].fillna(df['Birth Year'].mode()[0])
+    df = fill_missing_values(df)
 
     # ====================================
     # Identify outliers in relevant column
     # ------------------------------------
-    # Limits to detect outliers (3 std)
-    lower_bound = df['Trip Duration'].mean() - df['Trip Duration'].std() * 3
-    upper_bound = df['Trip Duration'].mean() + df['Trip Duration'].std() * 3
+    lower_bound, upper_bound = duration_bounds(df['Trip Duration'].mean(), df['Trip Duration'].std())
     # Identify outliers
     duration_outliers = df[(df['Trip Duration'] < lower_bound) | (df['Trip Duration'] > upper_bound)]
     print(f"Trip Duration outliers rows removed : {len(duration_outliers)}")
@@ -107,55 +167,60 @@ def clean_data(df):
     # ====================
     # Consistency problems
     # --------------------
-    # Check year (supposed 2017)
-    # print(df.groupby(df['Start Time'].dt.year).size())
-
-    # Drop negative duration rows
-    df = df[df['Trip Duration'] > 0]
-
-    # Check Start/End Time with Trip Duration
-    df['Calculated Trip Duration'] = (df['End Time'] - df['Start Time']).dt.total_seconds()
-    # Drop negative calculated duration rows
-    print(f"Negative Trip Duration rows removed : {len(df[df['Calculated Trip Duration'] < 0])}")
-    df = df[df['Calculated Trip Duration'] > 0]
-
-    # Identify inconsistent duration rows
-    inconsistent_duration = df[
-        (abs(df['Trip Duration'] - df['Calculated Trip Duration']) >
-         df[['Trip Duration', 'Calculated Trip Duration']].min(axis=1) * 0.01) &  # 1% tolerence
-        (abs(df['Trip Duration'] - df['Calculated Trip Duration']) > 300)  # 300 secs min threshold
-    ]
-    print(f"Anomalies/inconsistencies in trip durations removed : {len(inconsistent_duration)}")
-    # Drop rows with inconsistent duration
-    df = df.drop(inconsistent_duration.index)
+    df = drop_inconsistent_durations(df)
 
     # -----------------
     # Cleaned DataFrame
     return df
 
 
-def load_data(city, month, day):
+def read_trips(path):
     """
-    Loads data for the specified city and filters by month and day if applicable.
+    Reads a trips csv and adds the Month, Weekday and Hour columns (filters).
 
     Args:
-        (str) city - name of the city to analyze
-        (str) month - name of the month to filter by, or "all" to apply no month filter
-        (str) day - name of the day of week to filter by, or "all" to apply no day filter
+        (str) path - trips csv path
     Returns:
-        df - Pandas DataFrame containing city data filtered by month and day
+        df - "Uncleaned" Pandas DataFrame
     """
+    import pandas as pd
+
     # Data reading from selected csv
-    df = pd.read_csv(CITY_DATA[city], parse_dates=['Start Time', 'End Time'])
+    df = pd.read_csv(path, parse_dates=['Start Time', 'End Time'])
     df = df.rename(columns={df.columns[0]: 'Id'})
 
     # New columns for month and weekday (filters)
     df['Month'] = df['Start Time'].dt.month_name().str.lower()
     df['Weekday'] = df['Start Time'].dt.day_name().str.lower()
     df['Hour'] = df['Start Time'].dt.hour
+    return df
 
+
+def read_city_data(city):
+    """
+    Reads and cleans the full data of the specified city, without filtering.
+
+    Args:
+        (str) city - name of the city to analyze
+    Returns:
+        df - Cleaned Pandas DataFrame with Month, Weekday and Hour columns
+    """
     # Data cleaning
-    df = clean_data(df)
+    return clean_data(read_trips(CITY_DATA[city]))
+
+
+def load_data(city, month, day):
+    """
+    Loads data for the specified city and filters by month and day if applicable.
+
+    Args:
+        (str) city - name of the city to analyze
+        (str) month - name of the month to filter by, or "all" to apply no month filter
+        (str) day - name of the day of week to filter by, or "all" to apply no day filter
+    Returns:
+        df - Pandas DataFrame containing city data filtered by month and day
+    """
+    df = read_city_data(city)
 
     # Filtering (month & weekday)
     if month != 'all':
@@ -201,8 +266,14 @@ def time_stats(df):
     print("-" * 40)
 
 
-def station_stats(df):
-    """Displays statistics on the most popular stations and trip."""
+def station_stats(df, approximate=False):
+    """
+    Displays statistics on the most popular stations and trip.
+
+    Args:
+        df - Pandas DataFrame containing city data
+        (bool) approximate - use bounded-memory sketches (see bike_sketches) instead of exact counts
+    """
 
     print("\nCalculating The Most Popular Stations and Trip...\n")
     start_time = time.time()
@@ -212,6 +283,22 @@ def station_stats(df):
         print("/!\\ No data available to display station statistics.")
         return
 
+    if approximate:
+        from bike_sketches import CHUNK_SIZE, STATION_KEYS, sketch_chunks
+
+        # Fixed-size slices: value_counts memory is bounded by CHUNK_SIZE, not by len(df)
+        sketch = sketch_chunks(df.iloc[start:start + CHUNK_SIZE] for start in range(0, len(df), CHUNK_SIZE))
+        start_st, end_st, st_trip = (sketch.most_common(key) for key in STATION_KEYS)
+        print(f"The most commonly used start station is {start_st['item']}, "
+              f"with {start_st['lower']} to {start_st['upper']} occurrences.")
+        print(f"The most commonly used end station is {end_st['item']}, "
+              f"with {end_st['lower']} to {end_st['upper']} occurrences.")
+        print(f"The most common trip is: {st_trip['item']}, "
+              f"with {st_trip['lower']} to {st_trip['upper']} occurrences.")
+        print("\nThis took %s seconds." % (time.time() - start_time))
+        print("-" * 40)
+        return
+
     # Display the most commonly used start station
     start_st_counts = df['Start Station'].value_counts().sort_index()
     print(f"The most commonly used start station is {start_st_counts.idxmax()}, with {start_st_counts.max()} occurrences.")
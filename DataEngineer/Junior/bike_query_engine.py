@@ -0,0 +1,236 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+"""
+#=======================================================#
+| Bike Sharing - Multi-query engine - Fulll hiring test |
+#=======================================================#
+> Thomas Rigole
+---------------
+Loads and cleans each city once, stores the columns needed by the
+statistics as NumPy buffers in shared memory, and answers concurrent
+(city, month, day) filter requests from a worker pool attached to those
+buffers: only the filter and the small result dict cross processes.
+"""
+
+import argparse
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from multiprocessing import Pool
+from multiprocessing.shared_memory import SharedMemory
+
+import numpy as np
+import pandas as pd
+
+from bike_investigation import CITY_DATA, read_city_data
+
+MONTHS = ['january', 'february', 'march', 'april', 'may', 'june',
+          'july', 'august', 'september', 'october', 'november', 'december']
+DAYS = ['monday', 'tuesday', 'wednesday', 'thursday', 'friday', 'saturday', 'sunday']
+
+# Worker side: {city: {column: ndarray view on shared memory}} and station names
+_worker_columns = {}
+_worker_stations = {}
+_worker_shm = []
+
+
+def encode_city(df):
+    """
+    Encodes the columns used by the statistics as fixed-width NumPy arrays.
+
+    Args:
+        df - Cleaned Pandas DataFrame (see read_city_data)
+    Returns:
+        (dict) column name -> ndarray
+        (list) station names, indexed by the station codes
+    """
+    stations = pd.Categorical(pd.concat([df['Start Station'], df['End Station']])).categories
+    columns = {
+        'month': df['Start Time'].dt.month.to_numpy(np.int8) - 1,
+        'weekday': df['Start Time'].dt.weekday.to_numpy(np.int8),
+        'hour': df['Hour'].to_numpy(np.int8),
+        'duration': df['Trip Duration'].to_numpy(np.float64),
+        # Stations are sorted, so argmax ties resolve as sort_index().idxmax()
+        'start_station': stations.get_indexer(df['Start Station']).astype(np.int32),
+        'end_station': stations.get_indexer(df['End Station']).astype(np.int32),
+    }
+    return columns, list(stations)
+
+
+def _init_worker(layout, stations):
+    """Attaches the worker to the shared memory buffers of every city."""
+    for city, columns in layout.items():
+        _worker_columns[city] = {}
+        for column, (name, dtype, length) in columns.items():
+            shm = SharedMemory(name=name)
+            _worker_shm.append(shm)
+            _worker_columns[city][column] = np.ndarray(length, dtype=dtype, buffer=shm.buf)
+    _worker_stations.update(stations)
+
+
+def _most_common(codes, size):
+    # Negative codes are missing values (dropped by value_counts too)
+    counts = np.bincount(codes[codes >= 0], minlength=size)
+    return int(counts.argmax()), int(counts.max())
+
+
+def _most_common_name(codes, names):
+    # Ties resolved on the names, as time_stats sort_index().idxmax()
+    counts = np.bincount(codes, minlength=len(names))
+    return min(names[code] for code in np.flatnonzero(counts == counts.max())), int(counts.max())
+
+
+def answer_query(columns, stations, month, day):
+    """
+    Computes the statistics of bike_investigation on the filtered rows.
+
+    Args:
+        (dict) columns - encoded columns (see encode_city)
+        (list) stations - station names
+        (str) month - name of the month to filter by, or "all" to apply no month filter
+        (str) day - name of the day of week to filter by, or "all" to apply no day filter
+    Returns:
+        (dict) rows count and most common values / durations, only rows if empty
+    """
+    mask = np.ones(len(columns['month']), dtype=bool)
+    if month != 'all':
+        mask &= columns['month'] == MONTHS.index(month)
+    if day != 'all':
+        mask &= columns['weekday'] == DAYS.index(day)
+
+    rows = int(mask.sum())
+    if not rows:
+        return {'rows': 0}
+
+    month, month_count = _most_common_name(columns['month'][mask], MONTHS)
+    weekday, day_count = _most_common_name(columns['weekday'][mask], DAYS)
+    hour, hour_count = _most_common(columns['hour'][mask], 24)
+    start, start_count = _most_common(columns['start_station'][mask], len(stations))
+    end, end_count = _most_common(columns['end_station'][mask], len(stations))
+    start_codes, end_codes = columns['start_station'][mask], columns['end_station'][mask]
+    known = (start_codes >= 0) & (end_codes >= 0)
+    trips, trip_counts = np.unique(
+        start_codes[known].astype(np.int64) * len(stations) + end_codes[known], return_counts=True)
+    # Ties resolved on the "start --> end" strings, as station_stats sort_index().idxmax()
+    trip = min(f"{stations[code // len(stations)]} --> {stations[code % len(stations)]}"
+               for code in trips[trip_counts == trip_counts.max()].tolist())
+    duration = columns['duration'][mask]
+    return {
+        'rows': rows,
+        'most_common_month': (month, month_count),
+        'most_common_weekday': (weekday, day_count),
+        'most_common_hour': (hour, hour_count),
+        'most_common_start_station': (stations[start], start_count),
+        'most_common_end_station': (stations[end], end_count),
+        'most_common_trip': (trip, int(trip_counts.max())),
+        'total_duration': float(duration.sum()),
+        'mean_duration': float(duration.mean()),
+    }
+
+
+def _worker_query(city, month, day):
+    return answer_query(_worker_columns[city], _worker_stations[city], month, day)
+
+
+class QueryEngine:
+    """
+    Long-lived engine: cities are loaded once into shared memory,
+    queries are answered by a pool of worker processes.
+    """
+
+    def __init__(self, cities=tuple(CITY_DATA), processes=None):
+        self._shm = []
+        layout, stations = {}, {}
+        try:
+            for city in cities:
+                columns, stations[city] = encode_city(read_city_data(city))
+                layout[city] = {}
+                for column, values in columns.items():
+                    shm = SharedMemory(create=True, size=max(values.nbytes, 1))
+                    self._shm.append(shm)
+                    np.ndarray(values.shape, dtype=values.dtype, buffer=shm.buf)[:] = values
+                    layout[city][column] = (shm.name, values.dtype.str, len(values))
+            self._pool = Pool(processes, initializer=_init_worker, initargs=(layout, stations))
+        except BaseException:
+            self._release()
+            raise
+
+    def query(self, city, month='all', day='all'):
+        """Answers one filter request (blocking), see answer_query."""
+        return self._pool.apply(_worker_query, (city, month, day))
+
+    def _release(self):
+        for shm in self._shm:
+            shm.close()
+            shm.unlink()
+        self._shm = []
+
+    def close(self):
+        """Stops the workers and frees the shared memory."""
+        self._pool.terminate()
+        self._pool.join()
+        self._release()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def measure_latency(engine, cities, n_queries=1000, concurrency=8, seed=0):
+    """
+    Local load generator: sends random filter requests from concurrent clients.
+
+    Args:
+        (QueryEngine) engine - started engine
+        (list) cities - cities to query
+        (int) n_queries - number of requests
+        (int) concurrency - number of concurrent clients
+        (int) seed - random seed of the requests
+    Returns:
+        (dict) p50/p99 latency in milliseconds and throughput
+    """
+    rng = random.Random(seed)
+    requests = [(rng.choice(cities), rng.choice(['all'] + MONTHS[:6]), rng.choice(['all'] + DAYS))
+                for _ in range(n_queries)]
+    latencies = []
+    lock = threading.Lock()
+
+    def client(request):
+        start_time = time.perf_counter()
+        engine.query(*request)
+        with lock:
+            latencies.append(time.perf_counter() - start_time)
+
+    start_time = time.perf_counter()
+    with ThreadPoolExecutor(concurrency) as clients:
+        list(clients.map(client, requests))
+    elapsed = time.perf_counter() - start_time
+
+    return {
+        'queries': n_queries,
+        'p50_ms': float(np.percentile(latencies, 50) * 1000),
+        'p99_ms': float(np.percentile(latencies, 99) * 1000),
+        'queries_per_s': n_queries / elapsed,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Bike sharing multi-query engine latency benchmark")
+    parser.add_argument('--cities', nargs='+', default=list(CITY_DATA), choices=list(CITY_DATA))
+    parser.add_argument('--queries', type=int, default=1000, help="Number of requests")
+    parser.add_argument('--concurrency', type=int, default=8, help="Number of concurrent clients")
+    parser.add_argument('--processes', type=int, help="Number of workers (default: CPU count)")
+    args = parser.parse_args()
+
+    with QueryEngine(args.cities, args.processes) as engine:
+        stats = measure_latency(engine, args.cities, args.queries, args.concurrency)
+    print(f"{stats['queries']} queries: p50 {stats['p50_ms']:.2f}ms, p99 {stats['p99_ms']:.2f}ms, "
+          f"{stats['queries_per_s']:,.0f} queries/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+"""
+#================================================#
+| Bike Sharing - Warm runner - Fulll hiring test |
+#================================================#
+> Thomas Rigole
+---------------
+Persistent process answering statistics from the aggregates of a
+cleaned store (see bike_incremental.py) over a Unix socket, so that
+frequent tiny queries (e.g. cron jobs) do not pay the interpreter start-up.
+Aggregates are cached in memory until the store file changes.
+
+Start:  python bike_runner.py chicago_store.db /tmp/bike.sock &
+Query:  echo "start 3" | nc -U -N /tmp/bike.sock
+        (one request per connection: "<kind> [<top n>]", e.g. "rows", "trip 1")
+"""
+
+import argparse
+import os
+import socketserver
+import sqlite3
+import threading
+
+
+class AggregatesCache:
+    """In-memory copy of the store aggregates, reloaded when the store changes."""
+
+    def __init__(self, store_path):
+        self.store_path = store_path
+        self._lock = threading.Lock()
+        self._mtime = None
+        self._aggregates = {}
+
+    def get(self, kind):
+        """
+        Returns:
+            (list) (key, value) of the kind, sorted by decreasing value then key
+        """
+        with self._lock:
+            mtime = os.stat(self.store_path).st_mtime_ns
+            if mtime != self._mtime:
+                self._aggregates, self._mtime = {}, mtime
+            if kind not in self._aggregates:
+                con = sqlite3.connect(f"file:{self.store_path}?mode=ro", uri=True)
+                try:
+                    self._aggregates[kind] = con.execute(
+                        "SELECT key, value FROM aggregates WHERE kind = ? AND value != 0 "
+                        "ORDER BY value DESC, key", (kind,)).fetchall()
+                finally:
+                    con.close()
+            return self._aggregates[kind]
+
+
+def _format_value(value):
+    # Counts exactly, durations to the hundredth of a second (as trip_duration_stats)
+    return str(int(value)) if float(value).is_integer() else f"{value:.2f}"
+
+
+def answer(cache, request):
+    """
+    Answers one request line "<kind> [<top n>]".
+
+    Args:
+        (AggregatesCache) cache - aggregates of the store
+        (str) request - request line
+    Returns:
+        (str) "key<TAB>value" lines, or an error message
+    """
+    tokens = request.split()
+    try:
+        kind, top = tokens[0], int(tokens[1]) if len(tokens) > 1 else 1
+    except (IndexError, ValueError):
+        return "Invalid request, expected: <kind> [<top n>]\n"
+    rows = cache.get(kind)
+    if not rows:
+        return f"No aggregate for {kind}\n"
+    return "".join(f"{key}\t{_format_value(value)}\n" for key, value in rows[:top])
+
+
+class _Handler(socketserver.StreamRequestHandler):
+    def handle(self):
+        request = self.rfile.readline().decode()
+        self.wfile.write(answer(self.server.cache, request).encode())
+
+
+class BikeRunner(socketserver.ThreadingUnixStreamServer):
+    """Unix socket server answering requests from an AggregatesCache."""
+
+    daemon_threads = True
+
+    def __init__(self, socket_path, store_path):
+        if os.path.exists(socket_path):
+            os.remove(socket_path)
+        super().__init__(socket_path, _Handler)
+        self.cache = AggregatesCache(store_path)
+
+    def server_close(self):
+        super().server_close()
+        os.remove(self.server_address)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Warm runner answering bike statistics from a cleaned store")
+    parser.add_argument('store', help="SQLite store path (see bike_incremental.py)")
+    parser.add_argument('socket', help="Unix socket path")
+    args = parser.parse_args()
+
+    with BikeRunner(args.socket, args.store) as runner:
+        runner.serve_forever()
+
+
+if __name__ == "__main__":
+    main()
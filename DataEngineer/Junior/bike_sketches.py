@@ -0,0 +1,280 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+"""
+#=====================================================#
+| Bike Sharing - Station sketches - Fulll hiring test |
+#=====================================================#
+> Thomas Rigole
+---------------
+Bounded-memory approximation of the most popular stations and trip,
+for trip streams too large for exact value_counts:
+- Space-Saving keeps the `capacity` heaviest items, each with an error bound
+- Count-Min gives an upper bound of any item count
+Both are mergeable across chunks, files and processes (pickle them).
+"""
+
+import argparse
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+STATION_KEYS = ('start', 'end', 'trip')
+# Trips counted exactly at once before being sketched, bounds the memory of sketch_chunks
+CHUNK_SIZE = 100_000
+
+
+class SpaceSaving:
+    """
+    Space-Saving summary: for each monitored item, the true count is
+    between count - error and count. An unmonitored item count is at most floor().
+    A capacity of None keeps every item (exact summary).
+    """
+
+    def __init__(self, capacity=1000):
+        self.capacity = capacity
+        self.n = 0
+        self.counts = {}
+        self.errors = {}
+
+    def floor(self):
+        """Upper bound of the count of any unmonitored item."""
+        if self.capacity is None or not self.counts or len(self.counts) < self.capacity:
+            return 0
+        return min(self.counts.values())
+
+    def update(self, counts):
+        """
+        Adds exact counts of a chunk.
+
+        Args:
+            counts - item -> count mapping or Pandas Series (e.g. value_counts)
+        """
+        chunk = SpaceSaving(capacity=None)
+        chunk.counts = dict(counts.items())
+        chunk.errors = dict.fromkeys(chunk.counts, 0)
+        chunk.n = sum(chunk.counts.values())
+        self.merge(chunk)
+
+    def merge(self, other):
+        """Merges another summary into this one, keeping `capacity` items."""
+        floor, other_floor = self.floor(), other.floor()
+        counts, errors = {}, {}
+        for item in self.counts.keys() | other.counts.keys():
+            counts[item] = self.counts.get(item, floor) + other.counts.get(item, other_floor)
+            errors[item] = self.errors.get(item, floor) + other.errors.get(item, other_floor)
+        # Ties resolved by item order, as top(), so that merges are deterministic
+        kept = sorted(counts, key=lambda x: (-counts[x], x))[:self.capacity]
+        self.counts = {item: counts[item] for item in kept}
+        self.errors = {item: errors[item] for item in kept}
+        self.n += other.n
+
+    def top(self):
+        """
+        Returns:
+            (tuple) item, count, error of the heaviest item, ties resolved by item order
+        """
+        item = min(self.counts, key=lambda x: (-self.counts[x], x))
+        return item, self.counts[item], self.errors[item]
+
+
+class CountMin:
+    """
+    Count-Min sketch: estimate(item) >= true count, and
+    estimate(item) <= true count + epsilon * n with probability 1 - delta.
+    """
+
+    def __init__(self, width=2**16, depth=4):
+        self.width = width
+        self.depth = depth
+        self.n = 0
+        self.table = np.zeros((depth, width), dtype=np.int64)
+
+    @property
+    def epsilon(self):
+        return np.e / self.width
+
+    @property
+    def delta(self):
+        return np.exp(-self.depth)
+
+    def _columns(self, items):
+        # Keyed hashes are stable across processes, unlike hash()
+        items = np.asarray(items, dtype=object)
+        return [pd.util.hash_array(items, hash_key=f"{row:016d}") % self.width for row in range(self.depth)]
+
+    def update(self, counts):
+        """
+        Adds exact counts of a chunk.
+
+        Args:
+            counts - Pandas Series item -> count (e.g. value_counts)
+        """
+        for row, columns in enumerate(self._columns(counts.index)):
+            np.add.at(self.table[row], columns, counts.to_numpy(np.int64))
+        self.n += int(counts.sum())
+
+    def merge(self, other):
+        """Merges another sketch of the same shape into this one."""
+        if self.table.shape != other.table.shape:
+            raise ValueError("Count-Min sketches must have the same width and depth to be merged")
+        self.table += other.table
+        self.n += other.n
+
+    def estimate(self, item):
+        return int(min(self.table[row, columns[0]] for row, columns in enumerate(self._columns([item]))))
+
+
+class StationSketch:
+    """Sketches of the start stations, end stations and trips of a trip stream."""
+
+    def __init__(self, capacity=1000, width=2**16, depth=4):
+        self.heavy_hitters = {key: SpaceSaving(capacity) for key in STATION_KEYS}
+        self.count_min = {key: CountMin(width, depth) for key in STATION_KEYS}
+
+    def update(self, df):
+        """
+        Adds a chunk of trips.
+
+        Args:
+            df - Pandas DataFrame with Start Station and End Station columns
+        """
+        values = {
+            'start': df['Start Station'],
+            'end': df['End Station'],
+            'trip': df['Start Station'] + " --> " + df['End Station'],
+        }
+        for key, column in values.items():
+            counts = column.value_counts()
+            self.heavy_hitters[key].update(counts)
+            self.count_min[key].update(counts)
+
+    def merge(self, other):
+        """Merges the sketches of another chunk, file or process."""
+        for key in STATION_KEYS:
+            self.heavy_hitters[key].merge(other.heavy_hitters[key])
+            self.count_min[key].merge(other.count_min[key])
+
+    def most_common(self, key):
+        """
+        Most common item for 'start', 'end' or 'trip', with its error bounds.
+
+        Returns:
+            (dict) item, count estimate, lower/upper bounds of the true count,
+                   and whether the item is guaranteed to be the most common one
+        """
+        heavy_hitters = self.heavy_hitters[key]
+        item, count, error = heavy_hitters.top()
+        upper = min(count, self.count_min[key].estimate(item))
+        lower = count - error
+        # Best upper bound of any other item
+        others = [c for x, c in heavy_hitters.counts.items() if x != item] + [heavy_hitters.floor()]
+        return {
+            'item': item,
+            'count': upper,
+            'lower': lower,
+            'upper': upper,
+            'guaranteed': lower >= max(others),
+        }
+
+
+def sketch_chunks(chunks, capacity=1000):
+    """
+    Sketches a stream of trips chunk by chunk.
+
+    Args:
+        chunks - iterable of Pandas DataFrames with Start Station and End Station columns
+                 (e.g. read_csv(chunksize=...) or slices of a DataFrame)
+        (int) capacity - Space-Saving counters
+    Returns:
+        (StationSketch) sketch of all the chunks
+    """
+    sketch = StationSketch(capacity)
+    for chunk in chunks:
+        sketch.update(chunk)
+    return sketch
+
+
+def generate_trips(n_rows, n_stations=600, seed=0):
+    """
+    Generates Zipf-distributed synthetic trips.
+
+    Args:
+        (int) n_rows - number of trips
+        (int) n_stations - number of distinct stations
+        (int) seed - random seed
+    Returns:
+        df - Pandas DataFrame with Start Station and End Station columns
+    """
+    rng = np.random.default_rng(seed)
+    stations = np.array([f"Station {i:04d}" for i in range(n_stations)], dtype=object)
+    weights = 1 / np.arange(1, n_stations + 1)
+    weights /= weights.sum()
+    return pd.DataFrame({
+        'Start Station': stations[rng.choice(n_stations, n_rows, p=weights)],
+        'End Station': stations[rng.choice(n_stations, n_rows, p=weights)],
+    })
+
+
+def _sketch_chunk(n_rows, seed, capacity):
+    df = generate_trips(n_rows, seed=seed)
+    sketch = StationSketch(capacity)
+    sketch.update(df)
+    exact = {
+        'start': df['Start Station'].value_counts(),
+        'end': df['End Station'].value_counts(),
+        'trip': (df['Start Station'] + " --> " + df['End Station']).value_counts(),
+    }
+    return sketch, exact
+
+
+def validate(n_rows, chunk_size=10**6, capacity=1000, processes=None):
+    """
+    Compares the sketches to exact value_counts on generated trips.
+    Chunks are sketched in separate processes and merged.
+
+    Returns:
+        (dict) per key: exact and approximate answers, whether the exact count is within bounds
+               and whether the approximate item is the exact most common one
+    """
+    sizes = [min(chunk_size, n_rows - start) for start in range(0, n_rows, chunk_size)]
+    sketch = StationSketch(capacity)
+    exact = {key: pd.Series(dtype=np.int64) for key in STATION_KEYS}
+    with ProcessPoolExecutor(processes) as pool:
+        for chunk_sketch, chunk_exact in pool.map(_sketch_chunk, sizes, range(len(sizes)),
+                                                  [capacity] * len(sizes)):
+            sketch.merge(chunk_sketch)
+            for key in STATION_KEYS:
+                exact[key] = exact[key].add(chunk_exact[key], fill_value=0)
+
+    results = {}
+    for key in STATION_KEYS:
+        counts = exact[key].sort_index()
+        approx = sketch.most_common(key)
+        results[key] = {
+            'exact': (counts.idxmax(), int(counts.max())),
+            'approx': approx,
+            'within_bounds': approx['lower'] <= counts.get(approx['item'], 0) <= approx['upper'],
+            'correct': approx['item'] == counts.idxmax(),
+        }
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Validate station sketches against exact counts")
+    parser.add_argument('--rows', type=int, default=10**8, help="Number of generated trips")
+    parser.add_argument('--chunk-size', type=int, default=10**6, help="Trips per chunk")
+    parser.add_argument('--capacity', type=int, default=1000, help="Space-Saving counters")
+    args = parser.parse_args()
+
+    start_time = time.time()
+    for key, result in validate(args.rows, args.chunk_size, args.capacity).items():
+        print(f"{key}: exact {result['exact']}, approx {result['approx']}, "
+              f"within bounds: {result['within_bounds']}, correct: {result['correct']}")
+    print("\nThis took %s seconds." % (time.time() - start_time))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,141 @@
+import os
+import sqlite3
+import tempfile
+import unittest
+from unittest.mock import patch
+import pandas as pd
+import bike_incremental
+from bike_investigation import clean_data
+from bike_incremental import append_data, load_store, read_aggregates, welford_update
+
+
+class TestBikeIncremental(unittest.TestCase):
+
+    def setUp(self):
+        start = pd.date_range('2017-01-02 08:00:00', periods=24, freq='7h')
+        durations = [600 + 10 * i for i in range(23)] + [100000]
+        self.mock_df = pd.DataFrame({
+            'Id': range(24),
+            'Start Time': start,
+            'End Time': start + pd.to_timedelta(durations, unit='s'),
+            'Trip Duration': durations,
+            'Start Station': ['May St & Taylor St', 'Wood St & Hubbard St'] * 12,
+            'End Station': ['St. Louis Ave & Balmoral Ave'] * 24,
+            'User Type': ['Subscriber', None, 'Customer'] * 8,
+        })
+        self.mock_df['Month'] = self.mock_df['Start Time'].dt.month_name().str.lower()
+        self.mock_df['Weekday'] = self.mock_df['Start Time'].dt.day_name().str.lower()
+        self.mock_df['Hour'] = self.mock_df['Start Time'].dt.hour
+
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.store = os.path.join(self.tmpdir.name, 'store.db')
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def _append(self, df, tolerance=0.0):
+        con = sqlite3.connect(self.store)
+        try:
+            return append_data(con, df.copy(), tolerance)
+        finally:
+            con.close()
+
+    # ===================
+    # test_welford_update
+    # -------------------
+    def test_welford_update(self):
+        values = self.mock_df['Trip Duration'].astype(float)
+        n, mean, m2 = welford_update(0, 0.0, 0.0, values[:10])
+        n, mean, m2 = welford_update(n, mean, m2, values[10:])
+        self.assertEqual(n, 24)
+        self.assertAlmostEqual(mean, values.mean())
+        self.assertAlmostEqual(m2 / (n - 1) / values.var(), 1)
+
+    # ================
+    # test_append_data
+    # ----------------
+    def test_append_data_matches_clean_data(self):
+        self._append(self.mock_df.iloc[:12])
+        summary = self._append(self.mock_df.iloc[12:])
+        expected = clean_data(self.mock_df.copy())
+
+        self.assertEqual(summary['outliers'], 1)
+        self.assertEqual(sorted(load_store(self.store)['Id']), sorted(expected['Id']))
+        self.assertEqual(read_aggregates(self.store, 'rows')['all'], len(expected))
+        self.assertAlmostEqual(read_aggregates(self.store, 'duration')['total'], expected['Trip Duration'].sum())
+        self.assertEqual(read_aggregates(self.store, 'user_type').to_dict(),
+                         expected['User Type'].value_counts().sort_index().astype(float).to_dict())
+
+    def test_append_data_reflag(self):
+        # A duration only an outlier for the first batch bounds
+        df = self.mock_df.copy()
+        df.loc[5, ['Trip Duration']] = 1200
+        df.loc[5, 'End Time'] = df.loc[5, 'Start Time'] + pd.Timedelta(seconds=1200)
+        self._append(df.iloc[:12])
+        self.assertNotIn(5, load_store(self.store)['Id'].tolist())
+
+        summary = self._append(df.iloc[12:])
+        self.assertEqual(summary['reflagged'], 1)
+        self.assertIn(5, load_store(self.store)['Id'].tolist())
+        self.assertEqual(sorted(load_store(self.store)['Id']), sorted(clean_data(df.copy())['Id']))
+
+    def test_append_data_tolerance(self):
+        df = self.mock_df.copy()
+        df.loc[5, ['Trip Duration']] = 1200
+        df.loc[5, 'End Time'] = df.loc[5, 'Start Time'] + pd.Timedelta(seconds=1200)
+        self._append(df.iloc[:12])
+        # Bounds move within the tolerance: earlier rows are kept as flagged
+        summary = self._append(df.iloc[12:], tolerance=1000)
+        self.assertEqual(summary['reflagged'], 0)
+        self.assertNotIn(5, load_store(self.store)['Id'].tolist())
+
+    def test_append_data_skips_known_rows(self):
+        self._append(self.mock_df.iloc[:12])
+        summary = self._append(self.mock_df.iloc[:14])
+        self.assertEqual(summary['rows'], 2)
+        self.assertEqual(len(load_store(self.store, month='january')), 14)
+
+    def test_append_data_reload_keeps_state(self):
+        # Inconsistent duration row: dropped, but its Id is known
+        df = self.mock_df.copy()
+        df.loc[3, 'Trip Duration'] = 5000
+        self._append(df)
+        con = sqlite3.connect(self.store)
+        state = con.execute('SELECT n, mean, m2, lower, upper FROM state').fetchone()
+        con.close()
+
+        summary = self._append(df)
+        self.assertEqual(summary['rows'], 0)
+        con = sqlite3.connect(self.store)
+        self.assertEqual(con.execute('SELECT n, mean, m2, lower, upper FROM state').fetchone(), state)
+        con.close()
+        self.assertEqual(state[0], 24)
+
+    def test_append_data_failure_rolls_back(self):
+        self._append(self.mock_df.iloc[:12])
+        update_aggregates = bike_incremental._update_aggregates
+
+        def failing_update_aggregates(con, df, sign=1):
+            # Fails once the new trips are inserted
+            if con.execute('SELECT COUNT(*) FROM trips').fetchone()[0] > 12:
+                raise RuntimeError("Injected failure")
+            update_aggregates(con, df, sign)
+
+        with patch('bike_incremental._update_aggregates', side_effect=failing_update_aggregates):
+            with self.assertRaises(RuntimeError):
+                self._append(self.mock_df.iloc[12:])
+
+        # Store unchanged, the retry ingests the rows
+        self.assertEqual(len(load_store(self.store)), 12)
+        summary = self._append(self.mock_df.iloc[12:])
+        self.assertEqual(summary['rows'], 12)
+        con = sqlite3.connect(self.store)
+        self.assertEqual(con.execute('SELECT n FROM state').fetchone()[0], 24)
+        con.close()
+        expected = clean_data(self.mock_df.copy())
+        self.assertEqual(sorted(load_store(self.store)['Id']), sorted(expected['Id']))
+        self.assertEqual(read_aggregates(self.store, 'rows')['all'], len(expected))
+
+
+if __name__ == '__main__':
+    unittest.main()
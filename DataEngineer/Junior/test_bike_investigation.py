@@ -1,3 +1,6 @@
+import os
+import subprocess
+import sys
 import unittest
 from unittest.mock import patch
 import pandas as pd
@@ -190,6 +193,15 @@ class TestBikeShareData(unittest.TestCase):
         # Most common trip
         self.assertIn("The most common trip is: May St & Taylor St --> St. Louis Ave & Balmoral Ave, with 2 occurrences.", printed_output)
 
+    @patch('builtins.print')
+    def test_station_stats_approximate(self, mock_print):
+        station_stats(self.mock_df, approximate=True)
+        printed_output = [call[0][0] for call in mock_print.call_args_list]
+
+        # Small inputs are counted exactly by the sketches
+        self.assertIn("The most commonly used start station is May St & Taylor St, with 2 to 2 occurrences.", printed_output)
+        self.assertIn("The most common trip is: May St & Taylor St --> St. Louis Ave & Balmoral Ave, with 2 to 2 occurrences.", printed_output)
+
     @patch('builtins.print')
     def test_station_stats_missing_data(self, mock_print):
         data = {
@@ -269,6 +281,21 @@ class TestBikeShareData(unittest.TestCase):
         # No Birth Year identified
         self.assertIn('No data on dates of birth available for this city.', printed_output)
 
+    # ============
+    # test_startup
+    # ------------
+    def test_import_startup_budget(self):
+        # Cumulative import time of bike_investigation (us), pandas excluded
+        budget_us = 50_000
+        result = subprocess.run([sys.executable, '-X', 'importtime', '-c', 'import bike_investigation'],
+                                capture_output=True, text=True, check=True,
+                                cwd=os.path.dirname(os.path.abspath(__file__)))
+        # "import time: self [us] | cumulative | imported package" lines, header skipped
+        rows = [line.split('|') for line in result.stderr.splitlines()[1:]]
+        imports = {name.strip(): int(cumulative) for _, cumulative, name in rows}
+        self.assertNotIn('pandas', imports)
+        self.assertLess(imports['bike_investigation'], budget_us)
+
 
 if __name__ == '__main__':
     unittest.main()
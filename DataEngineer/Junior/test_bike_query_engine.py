@@ -0,0 +1,102 @@
+import unittest
+from unittest.mock import patch
+import pandas as pd
+from bike_investigation import load_data, read_city_data
+from bike_query_engine import QueryEngine, answer_query, encode_city, measure_latency
+
+
+class TestBikeQueryEngine(unittest.TestCase):
+
+    def setUp(self):
+        self.mock_data = {
+            '': [123, 456545, 15987, 42],
+            'Start Time': pd.to_datetime(['2017-01-01 09:13:21', '2017-01-02 09:07:57',
+                                          '2017-03-03 00:08:20', '2017-03-06 08:00:00']),
+            'End Time': pd.to_datetime(['2017-01-01 10:17:12', '2017-01-02 09:20:53',
+                                        '2017-03-03 00:20:53', '2017-03-06 08:12:00']),
+            'Trip Duration': [3831.35, 780, 750, 720],
+            'Start Station': ['Wood St & Hubbard St', 'May St & Taylor St', 'May St & Taylor St', 'Wood St & Hubbard St'],
+            'End Station': ['Larrabee St & Kingsbury St', 'St. Louis Ave & Balmoral Ave',
+                            'St. Louis Ave & Balmoral Ave', 'May St & Taylor St'],
+            'User Type': ['Subscriber', 'Customer', 'Customer', 'Customer'],
+            'Gender': ['Male', 'Female', 'Male', 'Female'],
+            'Birth Year': [1990, 1990, 2001, 1985]
+        }
+        self.mock_df = pd.DataFrame(self.mock_data)
+
+    # =================
+    # test_answer_query
+    # -----------------
+    @patch('pandas.read_csv')
+    def test_answer_query_matches_load_data(self, mock_read_csv):
+        mock_read_csv.return_value = self.mock_df
+        columns, stations = encode_city(load_data('chicago', 'all', 'all'))
+
+        test_cases = [
+            # (month, day)
+            ('all', 'all'), ('january', 'all'), ('all', 'monday'), ('march', 'friday'), ('march', 'sunday')
+        ]
+        for month, day in test_cases:
+            df = load_data('chicago', month, day)
+            result = answer_query(columns, stations, month, day)
+            self.assertEqual(result['rows'], len(df))
+            if df.empty:
+                continue
+            start_counts = df['Start Station'].value_counts().sort_index()
+            self.assertEqual(result['most_common_start_station'], (start_counts.idxmax(), start_counts.max()))
+            month_counts = df['Month'].value_counts().sort_index()
+            self.assertEqual(result['most_common_month'], (month_counts.idxmax(), month_counts.max()))
+            day_counts = df['Weekday'].value_counts().sort_index()
+            self.assertEqual(result['most_common_weekday'], (day_counts.idxmax(), day_counts.max()))
+            hour_counts = df['Hour'].value_counts().sort_index()
+            self.assertEqual(result['most_common_hour'], (hour_counts.idxmax(), hour_counts.max()))
+            self.assertAlmostEqual(result['mean_duration'], df['Trip Duration'].mean())
+
+    @patch('pandas.read_csv')
+    def test_answer_query_trip(self, mock_read_csv):
+        mock_read_csv.return_value = self.mock_df
+        columns, stations = encode_city(read_city_data('chicago'))
+        result = answer_query(columns, stations, 'all', 'all')
+        self.assertEqual(result['most_common_trip'],
+                         ('May St & Taylor St --> St. Louis Ave & Balmoral Ave', 2))
+
+    def test_answer_query_month_weekday_ties(self):
+        # January/Monday and April/Friday: alphabetical, not calendar, order
+        df = self.mock_df.iloc[:2].copy()
+        df['Start Time'] = pd.to_datetime(['2017-01-02 09:00:00', '2017-04-07 09:00:00'])
+        df['End Time'] = df['Start Time'] + pd.Timedelta(seconds=780)
+        df['Trip Duration'] = 780
+        with patch('pandas.read_csv', return_value=df):
+            columns, stations = encode_city(read_city_data('chicago'))
+            result = answer_query(columns, stations, 'all', 'all')
+        self.assertEqual(result['most_common_month'], ('april', 1))
+        self.assertEqual(result['most_common_weekday'], ('friday', 1))
+
+    def test_answer_query_trip_ties(self):
+        # 'A' < 'A & B' but 'A & B --> Y' < 'A --> Z'
+        df = self.mock_df.iloc[:2].copy()
+        df['Start Station'] = ['A', 'A & B']
+        df['End Station'] = ['Z', 'Y']
+        with patch('pandas.read_csv', return_value=df):
+            columns, stations = encode_city(read_city_data('chicago'))
+            result = answer_query(columns, stations, 'all', 'all')
+        self.assertEqual(result['most_common_trip'], ('A & B --> Y', 1))
+
+    # =================
+    # test_query_engine
+    # -----------------
+    @patch('pandas.read_csv')
+    def test_query_engine(self, mock_read_csv):
+        mock_read_csv.return_value = self.mock_df
+        with QueryEngine(['chicago', 'washington'], processes=2) as engine:
+            columns, stations = encode_city(load_data('chicago', 'all', 'all'))
+            self.assertEqual(engine.query('chicago', 'march'), answer_query(columns, stations, 'march', 'all'))
+            self.assertEqual(engine.query('washington', 'june', 'monday'), {'rows': 0})
+
+            stats = measure_latency(engine, ['chicago', 'washington'], n_queries=50, concurrency=4)
+            self.assertEqual(stats['queries'], 50)
+            self.assertLessEqual(stats['p50_ms'], stats['p99_ms'])
+
+
+if __name__ == '__main__':
+    unittest.main()
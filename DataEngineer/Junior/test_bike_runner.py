@@ -0,0 +1,79 @@
+import os
+import socket
+import sqlite3
+import tempfile
+import threading
+import unittest
+import pandas as pd
+from bike_incremental import append_data
+from bike_runner import BikeRunner
+
+
+class TestBikeRunner(unittest.TestCase):
+
+    def setUp(self):
+        start = pd.date_range('2017-01-02 08:00:00', periods=12, freq='7h')
+        self.mock_df = pd.DataFrame({
+            'Id': range(12),
+            'Start Time': start,
+            'End Time': start + pd.Timedelta(seconds=600),
+            'Trip Duration': [600] * 12,
+            'Start Station': ['May St & Taylor St'] * 8 + ['Wood St & Hubbard St'] * 4,
+            'End Station': ['St. Louis Ave & Balmoral Ave'] * 12,
+            'User Type': ['Subscriber'] * 12,
+        })
+        self.mock_df['Month'] = self.mock_df['Start Time'].dt.month_name().str.lower()
+        self.mock_df['Weekday'] = self.mock_df['Start Time'].dt.day_name().str.lower()
+        self.mock_df['Hour'] = self.mock_df['Start Time'].dt.hour
+
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.store = os.path.join(self.tmpdir.name, 'store.db')
+        self._append(self.mock_df.iloc[:6])
+
+        self.runner = BikeRunner(os.path.join(self.tmpdir.name, 'bike.sock'), self.store)
+        threading.Thread(target=self.runner.serve_forever, daemon=True).start()
+
+    def tearDown(self):
+        self.runner.shutdown()
+        self.runner.server_close()
+        self.tmpdir.cleanup()
+
+    def _append(self, df):
+        con = sqlite3.connect(self.store)
+        try:
+            append_data(con, df.copy())
+        finally:
+            con.close()
+
+    def _query(self, request):
+        with socket.socket(socket.AF_UNIX) as client:
+            client.connect(self.runner.server_address)
+            client.sendall(f"{request}\n".encode())
+            return b''.join(iter(lambda: client.recv(4096), b'')).decode()
+
+    # ============
+    # test_runner
+    # ------------
+    def test_runner_answers(self):
+        self.assertEqual(self._query('start'), "May St & Taylor St\t6\n")
+        self.assertEqual(self._query('rows'), "all\t6\n")
+        self.assertEqual(self._query('unknown'), "No aggregate for unknown\n")
+        self.assertIn("Invalid request", self._query('start two'))
+
+    def test_runner_reloads_changed_store(self):
+        self.assertEqual(self._query('start 2'), "May St & Taylor St\t6\n")
+        self._append(self.mock_df.iloc[6:])
+        self.assertEqual(self._query('start 2'), "May St & Taylor St\t8\nWood St & Hubbard St\t4\n")
+
+    def test_runner_large_values(self):
+        con = sqlite3.connect(self.store)
+        con.execute("UPDATE aggregates SET value = 1234567 WHERE kind = 'rows'")
+        con.execute("UPDATE aggregates SET value = 123456789.25 WHERE kind = 'duration'")
+        con.commit()
+        con.close()
+        self.assertEqual(self._query('rows'), "all\t1234567\n")
+        self.assertEqual(self._query('duration'), "total\t123456789.25\n")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,94 @@
+import pickle
+import unittest
+import pandas as pd
+from bike_sketches import CountMin, SpaceSaving, StationSketch, generate_trips, sketch_chunks, validate
+
+
+class TestBikeSketches(unittest.TestCase):
+
+    def setUp(self):
+        self.trips = generate_trips(20000, n_stations=200, seed=1)
+
+    # ================
+    # test_SpaceSaving
+    # ----------------
+    def test_space_saving_exact_under_capacity(self):
+        summary = SpaceSaving(capacity=10)
+        summary.update(pd.Series(['a', 'b', 'a', 'c', 'a', 'b']).value_counts())
+        self.assertEqual(summary.top(), ('a', 3, 0))
+        self.assertEqual(summary.floor(), 0)
+
+    def test_space_saving_exact_updates_under_capacity(self):
+        summary = SpaceSaving(capacity=1000)
+        summary.update(pd.Series({'A': 10}))
+        summary.update(pd.Series({'B': 12, 'C': 5}))
+        summary.update(pd.Series({'A': 1, 'C': 2}))
+        self.assertEqual(summary.counts, {'A': 11, 'B': 12, 'C': 7})
+        self.assertEqual(summary.errors, {'A': 0, 'B': 0, 'C': 0})
+        self.assertEqual(summary.top(), ('B', 12, 0))
+
+    def test_station_sketch_exact_updates_under_capacity(self):
+        sketch = sketch_chunks([pd.DataFrame({'Start Station': ['A'] * 10, 'End Station': ['X'] * 10}),
+                                pd.DataFrame({'Start Station': ['B'] * 12 + ['C'] * 5, 'End Station': ['X'] * 17})])
+        result = sketch.most_common('start')
+        self.assertEqual((result['item'], result['lower'], result['upper']), ('B', 12, 12))
+        self.assertTrue(result['guaranteed'])
+
+    def test_space_saving_merge_ties_deterministic(self):
+        summary = SpaceSaving(capacity=2)
+        summary.update(pd.Series({'d': 1, 'b': 1, 'c': 1, 'a': 1}))
+        self.assertEqual(list(summary.counts), ['a', 'b'])
+
+    def test_space_saving_bounds(self):
+        summary = SpaceSaving(capacity=50)
+        exact = pd.Series(dtype='int64')
+        for start in range(0, len(self.trips), 1000):
+            counts = self.trips['Start Station'].iloc[start:start + 1000].value_counts()
+            summary.update(counts)
+            exact = exact.add(counts, fill_value=0)
+        self.assertEqual(len(summary.counts), 50)
+        for item, count in summary.counts.items():
+            self.assertLessEqual(count - summary.errors[item], exact[item])
+            self.assertGreaterEqual(count, exact[item])
+
+    # =============
+    # test_CountMin
+    # -------------
+    def test_count_min_merge(self):
+        counts = self.trips['End Station'].value_counts()
+        sketch, half, other_half = CountMin(width=256), CountMin(width=256), CountMin(width=256)
+        sketch.update(counts)
+        half.update(counts.iloc[::2])
+        other_half.update(counts.iloc[1::2])
+        half.merge(pickle.loads(pickle.dumps(other_half)))
+        self.assertTrue((sketch.table == half.table).all())
+        for item, count in counts.items():
+            self.assertGreaterEqual(sketch.estimate(item), count)
+        with self.assertRaises(ValueError):
+            sketch.merge(CountMin(width=128))
+
+    # ==================
+    # test_StationSketch
+    # ------------------
+    def test_station_sketch_most_common(self):
+        sketch = StationSketch(capacity=100)
+        for start in range(0, len(self.trips), 5000):
+            chunk_sketch = StationSketch(capacity=100)
+            chunk_sketch.update(self.trips.iloc[start:start + 5000])
+            sketch.merge(chunk_sketch)
+
+        counts = self.trips['Start Station'].value_counts().sort_index()
+        result = sketch.most_common('start')
+        self.assertEqual(result['item'], counts.idxmax())
+        self.assertTrue(result['lower'] <= counts.max() <= result['upper'])
+        self.assertTrue(result['guaranteed'])
+
+    def test_validate(self):
+        for key, result in validate(30000, chunk_size=10000, capacity=200, processes=2).items():
+            self.assertTrue(result['within_bounds'], key)
+            if result['approx']['guaranteed']:
+                self.assertTrue(result['correct'], key)
+
+
+if __name__ == '__main__':
+    unittest.main()